@@ -5,12 +5,17 @@ import pandas as pd
 import csv
 import time
 import os
+import sys
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from model_classes import ArimaModel, SarimaxModel
 from send_email import send_email
 
 PREDICT_DAY_COUNT = 10
+BTC_PAGE_DAYS = 2000
+BACKFILL_WORKERS = 8
+SECONDS_IN_DAY = 86400
 
 amount_of_days = 10
 
@@ -20,7 +25,7 @@ def main():
     warnings.filterwarnings("ignore", message=".*An unsupported index was provided and will be ignored when e.g. forecasting.*", module="statsmodels.*")
     warnings.filterwarnings("ignore", message="No supported index is available. Prediction results will be given with an integer index beginning at `start`.", module="statsmodels.*")
 
-    run_predict()
+    run_predict(backfill="--backfill" in sys.argv)
 
 #     schedule.every().day.at("13:00").do(job)
 
@@ -33,10 +38,14 @@ def main():
 #     run_predict()
 
 
-def fetch_data():
+def fetch_data(backfill=False):
     """
     Fetches greed index and BTC price data from their respective APIs.
 
+    Parameters:
+        backfill (bool, optional): If True, fetches the full BTC price history back to the oldest
+            greed index entry instead of only the latest 2000 days. Defaults to False.
+
     Returns:
         tuple: Contains two lists, greed index data and BTC price data, respectively.
 
@@ -48,24 +57,101 @@ def fetch_data():
 
     greedIndexURL = "https://api.alternative.me/fng/?limit=100000&date_format=eu"
     key = "6a3f091047ad80bb804e418f7880da6fabebe0354ba1936578d7adc6d31e906d"
-    BTCPriceURL = f"https://min-api.cryptocompare.com/data/v2/histoday?fsym=BTC&tsym=USD&limit=2000&api_key={key}"
+    BTCPriceURL = f"https://min-api.cryptocompare.com/data/v2/histoday?fsym=BTC&tsym=USD&limit={BTC_PAGE_DAYS}&api_key={key}"
 
     try:
         greed_response = requests.get(greedIndexURL)
         greed_response.raise_for_status()
-        btc_response = requests.get(BTCPriceURL)
-        btc_response.raise_for_status()
+        greedJSON = greed_response.json().get("data", [])
+
+        if backfill:
+            btcJSON = fetch_btc_history(BTCPriceURL, greedJSON)
+        else:
+            btc_response = requests.get(BTCPriceURL)
+            btc_response.raise_for_status()
+            btcJSON = btc_response.json().get("Data", {}).get("Data", [])
     except requests.exceptions.RequestException as e:
         raise SystemExit(f"Network error occurred: {e}")
 
-    greedJSON = greed_response.json().get("data", [])
-    btcJSON = btc_response.json().get("Data", {}).get("Data", [])
-
     if not greedJSON or not btcJSON:
         raise ValueError("One or more datasets are empty or unavailable.")
 
     return greedJSON, btcJSON
 
+def fetch_btc_history(BTCPriceURL, greedJSON):
+    """
+    Fetches the full BTC price history covered by the greed index, in concurrent pages.
+
+    CryptoCompare returns at most 2000 days per request, so the range from the oldest greed index
+    entry up to now is split into pages anchored with `toTs` and fetched by a bounded thread pool.
+
+    Parameters:
+        BTCPriceURL (str): The CryptoCompare histoday URL, without a `toTs` parameter.
+        greedJSON (list): List of dictionaries containing greed index data.
+
+    Returns:
+        list: BTC price data sorted by time in ascending order, without duplicate days.
+
+    Raises:
+        requests.exceptions.RequestException: If any of the page requests fails.
+        ValueError: If any page reports an API error or contains no data.
+    """
+    now = int(time.time())
+    oldest = now
+    for item in greedJSON:
+        try:
+            unix_time = greed_unix_time(item)
+        except ValueError as e:
+            print(f"Skipping item due to date parsing error: {e}")
+            continue
+        oldest = min(oldest, unix_time)
+
+    page_span = BTC_PAGE_DAYS * SECONDS_IN_DAY
+    page_ends = []
+    to_ts = now
+    while True:
+        page_ends.append(to_ts)
+        if to_ts - page_span <= oldest:
+            break
+        to_ts -= page_span
+
+    def fetch_page(to_ts):
+        response = requests.get(f"{BTCPriceURL}&toTs={to_ts}")
+        response.raise_for_status()
+        page_json = response.json()
+        if page_json.get("Response") == "Error":
+            raise ValueError(f"BTC price page ending at {to_ts} failed: {page_json.get('Message')}")
+        page = page_json.get("Data", {}).get("Data", [])
+        if not page:
+            raise ValueError(f"BTC price page ending at {to_ts} is empty.")
+        return page
+
+    with ThreadPoolExecutor(max_workers=min(BACKFILL_WORKERS, len(page_ends))) as executor:
+        pages = list(executor.map(fetch_page, page_ends))
+
+    btcByTime = {}
+    for page in pages:
+        for BTCItem in page:
+            btcByTime[BTCItem.get("time")] = BTCItem
+
+    return [btcByTime[t] for t in sorted(btcByTime)]
+
+def greed_unix_time(item):
+    """
+    Converts the 'dd-mm-YYYY' timestamp of a greed index item to Unix time.
+
+    Parameters:
+        item (dict): A greed index data item.
+
+    Returns:
+        int: The Unix time of the item's date.
+
+    Raises:
+        ValueError: If the timestamp is not in the expected format.
+    """
+    date_object = datetime.strptime(item["timestamp"], '%d-%m-%Y')
+    return int(time.mktime(date_object.timetuple()))
+
 def create_csv(greedJSON, btcJSON, file_name='data.csv'):
     """
     Creates a CSV file from greed index and BTC price data.
@@ -82,8 +168,7 @@ def create_csv(greedJSON, btcJSON, file_name='data.csv'):
     rows = []
     for item in greedJSON:
         try:
-            date_object = datetime.strptime(item["timestamp"], '%d-%m-%Y')
-            unix_time = int(time.mktime(date_object.timetuple()))
+            unix_time = greed_unix_time(item)
         except ValueError as e:
             print(f"Skipping item due to date parsing error: {e}")
             continue
@@ -117,7 +202,7 @@ def create_csv(greedJSON, btcJSON, file_name='data.csv'):
     except IOError as e:
         raise SystemExit(f"Failed to write data to {file_name}: {e}")
 
-def get_csv():
+def get_csv(backfill=False):
     """
     Fetches data from APIs and creates a CSV file with greed index and BTC price data.
 
@@ -125,10 +210,13 @@ def get_csv():
     1. Calls `fetch_data()` to retrieve greed index and BTC price data from their APIs.
     2. Calls `create_csv()` with the fetched data to generate a 'data.csv' file.
 
+    Parameters:
+        backfill (bool, optional): If True, fetches the full BTC price history. Defaults to False.
+
     Raises:
         Passes through any exceptions raised by `fetch_data()` or `create_csv()`.
     """
-    greedJSON, btcJSON = fetch_data()
+    greedJSON, btcJSON = fetch_data(backfill)
     create_csv(greedJSON, btcJSON)
 
 def get_pandas_df(file):
@@ -162,7 +250,7 @@ def get_pandas_df(file):
 
     return df
 
-def run_predict():
+def run_predict(backfill=False):
     """
     Orchestrates the fetching of data, prediction processes, and sending of email with forecast results.
 
@@ -172,6 +260,10 @@ def run_predict():
     3. Generating predictions using both ARIMA and SARIMAX models on the fetched data.
     4. Sending an email with the prediction results.
 
+    Parameters:
+        backfill (bool, optional): If True, rebuilds 'data.csv' from the full BTC price history
+            instead of only the latest 2000 days. Defaults to False.
+
     Exceptions:
         Any exceptions raised during data preparation, model processing, or email sending are caught and logged,
         halting the execution of subsequent steps.
@@ -179,7 +271,7 @@ def run_predict():
 
     file = "data.csv"
     try:
-        get_csv()
+        get_csv(backfill)
         df = get_pandas_df(file)
     except (SystemExit, FileNotFoundError, ValueError) as e:
         print(f"Error preparing data: {e}")
@@ -1,7 +1,7 @@
 from datetime import datetime
 import pytest
 import pandas as pd
-from project import get_pandas_df, create_csv, fetch_data, run_predict
+from project import get_pandas_df, create_csv, fetch_data, fetch_btc_history, run_predict
 import json
 import os
 from send_email import send_email
@@ -65,6 +65,43 @@ def test_create_csv_invalid():
     with pytest.raises(TypeError):
         create_csv(invalidJSON, invalidJSON, 'output.csv')
 
+def test_fetch_btc_history_backfill(mocker):
+    greedJSON = [{"value": "75", "timestamp": "30-03-2024"}, {"value": "20", "timestamp": "01-02-2018"}]
+    oldest = int(time.mktime(datetime(2018, 2, 1).timetuple()))
+    now = 1711800000
+    page_span = 2000 * 86400
+
+    def fake_get(url):
+        to_ts = int(url.split("toTs=")[1])
+        response = mocker.Mock()
+        response.json.return_value = {"Response": "Success", "Data": {"Data": [
+            {"time": to_ts - page_span, "open": 1.0},
+            {"time": to_ts, "open": 2.0},
+        ]}}
+        return response
+
+    mocker.patch('project.time.time', return_value=now)
+    mock_get = mocker.patch('project.requests.get', side_effect=fake_get)
+
+    btcJSON = fetch_btc_history("https://example.com/histoday?limit=2000", greedJSON)
+    times = [item["time"] for item in btcJSON]
+    requested = sorted(int(call.args[0].split("toTs=")[1]) for call in mock_get.call_args_list)
+
+    assert requested == [now - page_span, now]
+    assert times == [now - 2 * page_span, now - page_span, now]
+    assert times[0] <= oldest
+
+def test_fetch_btc_history_page_error(mocker):
+    greedJSON = [{"value": "75", "timestamp": "30-03-2024"}]
+    response = mocker.Mock()
+    response.json.return_value = {"Response": "Error", "Message": "You are over your rate limit", "Data": {}}
+
+    mocker.patch('project.time.time', return_value=1711800000)
+    mocker.patch('project.requests.get', return_value=response)
+
+    with pytest.raises(ValueError, match="rate limit"):
+        fetch_btc_history("https://example.com/histoday?limit=2000", greedJSON)
+
 def test_email_sending_success(mocker):
     mock_smtp_class = mocker.patch('send_email.smtplib.SMTP_SSL')
     mocker.patch('builtins.open', mocker.mock_open(read_data="test@example.com\n"))